@@ -1,13 +1,19 @@
+import dataclasses
+import functools
 import os
-from pathlib import Path
+import shutil
 import copy
-from typing import Callable, List, Optional, Text, Dict, Any
+from typing import Callable, FrozenSet, List, Optional, Text, Dict, Any, Tuple
+import uuid
 
+from _pytest.fixtures import SubRequest
 from _pytest.monkeypatch import MonkeyPatch
 import pytest
+from pytest import TempPathFactory
 
 
 from rasa.engine.graph import ExecutionContext, GraphComponent, GraphSchema, SchemaNode
+from rasa.engine.storage.local_model_storage import LocalModelStorage
 from rasa.engine.storage.resource import Resource
 from rasa.engine.storage.storage import ModelStorage
 from rasa.graph_components.validators.finetuning_validator import FinetuningValidator
@@ -19,6 +25,7 @@ from rasa.shared.constants import (
     DEFAULT_DOMAIN_PATH,
 )
 from rasa.shared.core.domain import KEY_RESPONSES, Domain
+from rasa.shared.core.training_data.structures import StoryGraph
 from rasa.shared.importers.rasa import RasaFileImporter
 from rasa.shared.importers.importer import NluDataImporter, TrainingDataImporter
 import rasa.shared.utils.io
@@ -28,9 +35,37 @@ from rasa.shared.nlu.training_data.message import Message
 from rasa.shared.nlu.training_data.training_data import TrainingData
 
 
+_NLU_CORE_PARAMS: List[Tuple[bool, bool]] = [
+    (True, False),
+    (False, True),
+    (True, True),
+]
+
+# keep the tests of this module on one worker so they share the module fixtures
+pytestmark = pytest.mark.xdist_group("finetuning_validator")
+
+
+@pytest.fixture(scope="module")
+def default_model_storage(tmp_path_factory: TempPathFactory) -> ModelStorage:
+    # shared by all tests in this module so that trained validators can be reused
+    return LocalModelStorage.create(tmp_path_factory.mktemp("finetuning-validator"))
+
+
+@pytest.fixture(scope="module")
+def default_execution_context() -> ExecutionContext:
+    return ExecutionContext(GraphSchema({}), uuid.uuid4().hex)
+
+
 @pytest.fixture
 def default_resource() -> Resource:
-    return Resource("FineTuningValidator")
+    # unique per test as the model storage is shared by all tests in this module
+    return Resource(f"FineTuningValidator-{uuid.uuid4().hex}")
+
+
+@functools.lru_cache(maxsize=None)
+def _default_config() -> Dict[Text, Any]:
+    # shared by all validators - the validator only reads its config
+    return FinetuningValidator.get_default_config()
 
 
 ValidationMethodType = Callable[
@@ -38,31 +73,61 @@ ValidationMethodType = Callable[
 ]
 
 
+def _create_finetuning_validator(
+    model_storage: ModelStorage,
+    resource: Resource,
+    execution_context: ExecutionContext,
+    load: bool,
+    config: Dict[Text, Any],
+) -> FinetuningValidator:
+    if load:
+        constructor = FinetuningValidator.load
+    else:
+        constructor = FinetuningValidator.create
+    return constructor(
+        config={**_default_config(), **config},
+        execution_context=execution_context,
+        model_storage=model_storage,
+        resource=resource,
+    )
+
+
+def _copy_resource(model_storage: ModelStorage, resource: Resource) -> Resource:
+    copied_resource = Resource(f"FineTuningValidator-{uuid.uuid4().hex}")
+    with model_storage.read_from(resource) as source:
+        with model_storage.write_to(copied_resource) as target:
+            shutil.copytree(source, target, dirs_exist_ok=True)
+    return copied_resource
+
+
 @pytest.fixture
 def get_finetuning_validator(
     default_model_storage: ModelStorage,
     default_execution_context: ExecutionContext,
     default_resource: Resource,
-) -> Callable[[bool, bool, Dict[Text, Any], GraphSchema], FinetuningValidator]:
+) -> Callable[..., FinetuningValidator]:
     def inner(
         finetuning: bool,
         load: bool,
         config: Dict[Text, Any],
         graph_schema: Optional[GraphSchema] = None,
+        resource: Optional[Resource] = None,
     ) -> FinetuningValidator:
-        if load:
-            constructor = FinetuningValidator.load
-        else:
-            constructor = FinetuningValidator.create
-        if finetuning:
-            default_execution_context.is_finetuning = finetuning
-        if graph_schema is not None:
-            default_execution_context.graph_schema = graph_schema
-        return constructor(
-            config={**FinetuningValidator.get_default_config(), **config},
-            execution_context=default_execution_context,
-            model_storage=default_model_storage,
-            resource=default_resource,
+        if graph_schema is None:
+            graph_schema = default_execution_context.graph_schema
+        if resource is None:
+            resource = default_resource
+        elif load:
+            # passed resources are shared between tests - load a copy since
+            # validators persist their fingerprints whenever they validate
+            resource = _copy_resource(default_model_storage, resource)
+        execution_context = dataclasses.replace(
+            default_execution_context,
+            is_finetuning=finetuning,
+            graph_schema=graph_schema,
+        )
+        return _create_finetuning_validator(
+            default_model_storage, resource, execution_context, load, config
         )
 
     return inner
@@ -70,20 +135,22 @@ def get_finetuning_validator(
 
 @pytest.fixture
 def get_validation_method(
-    get_finetuning_validator: Callable[[bool, bool], FinetuningValidator]
-) -> Callable[[bool, bool, bool, bool, GraphSchema], ValidationMethodType]:
+    get_finetuning_validator: Callable[..., FinetuningValidator]
+) -> Callable[..., ValidationMethodType]:
     def inner(
         finetuning: bool,
         load: bool,
         nlu: bool,
         core: bool,
         graph_schema: Optional[GraphSchema] = None,
+        resource: Optional[Resource] = None,
     ) -> ValidationMethodType:
         validator = get_finetuning_validator(
             finetuning=finetuning,
             load=load,
             config={"validate_core": core, "validate_nlu": nlu},
             graph_schema=graph_schema,
+            resource=resource,
         )
 
         return validator.validate
@@ -91,12 +158,49 @@ def get_validation_method(
     return inner
 
 
+def _train_validator(
+    model_storage: ModelStorage,
+    importer: TrainingDataImporter,
+    nlu: bool,
+    core: bool,
+    graph_schema: Optional[GraphSchema] = None,
+) -> Resource:
+    resource = Resource(f"FineTuningValidator-{uuid.uuid4().hex}")
+    if graph_schema is None:
+        graph_schema = GraphSchema({})
+    validator = _create_finetuning_validator(
+        model_storage,
+        resource,
+        ExecutionContext(graph_schema, uuid.uuid4().hex),
+        load=False,
+        config={"validate_core": core, "validate_nlu": nlu},
+    )
+    validator.validate(importer=importer)
+    return resource
+
+
+# `nlu` and `core` are parametrized indirectly so that the module-scoped trained
+# resources below are trained once per combination instead of once per test
+@pytest.fixture(scope="module")
+def nlu(request: SubRequest) -> bool:
+    return request.param
+
+
+@pytest.fixture(scope="module")
+def core(request: SubRequest) -> bool:
+    return request.param
+
+
+# shared by all importers below - don't modify
+_EMPTY_CONFIG: Dict = {}
+
+
 class DummyNLUDataImporter(NluDataImporter):
     def __init__(self, messages: List[Message]) -> None:
         self.training_data = TrainingData(training_examples=messages)
 
     def get_config(self) -> Dict:
-        return {}
+        return _EMPTY_CONFIG
 
     def get_nlu_data(self, language: Optional[Text] = "en") -> TrainingData:
         return self.training_data
@@ -107,6 +211,11 @@ class EmptyDataImporter(DummyNLUDataImporter):
         super().__init__([])
 
 
+@pytest.fixture(scope="module")
+def empty_data_importer() -> EmptyDataImporter:
+    return EmptyDataImporter()
+
+
 def _project_files(
     project: Text,
     config_file: Text = DEFAULT_CONFIG_PATH,
@@ -119,7 +228,7 @@ def _project_files(
         "training_data_paths": training_files,
     }
     paths = {
-        k: v if v is None or Path(v).is_absolute() else os.path.join(project, v)
+        k: v if v is None or os.path.isabs(v) else os.path.join(project, v)
         for k, v in paths.items()
     }
     paths["training_data_paths"] = [paths["training_data_paths"]]
@@ -127,57 +236,110 @@ def _project_files(
     return RasaFileImporter(**paths)
 
 
-@pytest.mark.parametrize("nlu, core", [(True, False), (False, True), (True, True)])
+@functools.lru_cache(maxsize=None)
+def _load_project_once(project: Text) -> Dict[Text, Any]:
+    importer = _project_files(project)
+    return {"domain": importer.get_domain(), "nlu_data": importer.get_nlu_data()}
+
+
+class CachedProjectImporter(TrainingDataImporter):
+    """Serves the domain and NLU data of a project which are only read once.
+
+    The cached objects are shared between all instances and must not be modified.
+    Everything else is read from the project files on demand.
+    """
+
+    def __init__(self, project: Text) -> None:
+        self._project = project
+
+    def get_domain(self) -> Domain:
+        return _load_project_once(self._project)["domain"]
+
+    def get_nlu_data(self, language: Optional[Text] = "en") -> TrainingData:
+        return _load_project_once(self._project)["nlu_data"]
+
+    def get_stories(self, exclusion_percentage: Optional[int] = None) -> StoryGraph:
+        return _project_files(self._project).get_stories(exclusion_percentage)
+
+    def get_config(self) -> Dict:
+        return _project_files(self._project).get_config()
+
+    def get_config_file_for_auto_config(self) -> Optional[Text]:
+        return _project_files(self._project).get_config_file_for_auto_config()
+
+
+@pytest.fixture(scope="module")
+def trained_project_resource(
+    default_model_storage: ModelStorage, project: Text, nlu: bool, core: bool
+) -> Resource:
+    return _train_validator(
+        default_model_storage, CachedProjectImporter(project), nlu, core
+    )
+
+
+def _domain_as_dict_snapshot(domain: Domain) -> Dict[Text, Any]:
+    # `as_dict` returns the domain's own data - copy the responses since the tests
+    # modify them (`Domain.from_dict` leaves the other sections as they are)
+    domain_as_dict = domain.as_dict()
+    return {
+        **domain_as_dict,
+        KEY_RESPONSES: copy.deepcopy(domain_as_dict[KEY_RESPONSES]),
+    }
+
+
+@pytest.mark.parametrize("nlu, core", _NLU_CORE_PARAMS, indirect=True)
 def test_validate_after_changing_response_text_in_domain(
     get_validation_method: Callable[..., ValidationMethodType],
+    trained_project_resource: Resource,
     project: Text,
     nlu: bool,
     core: bool,
 ):
-    # training
-    importer = _project_files(project)
+    importer = CachedProjectImporter(project)
     old_domain = importer.get_domain()
 
-    validate = get_validation_method(finetuning=False, load=False, core=core, nlu=nlu)
-    validate(importer=importer)
-
     # Change NLG content but keep actions the same
-    domain_with_changed_nlg = old_domain.as_dict()
+    domain_with_changed_nlg = _domain_as_dict_snapshot(old_domain)
     domain_with_changed_nlg[KEY_RESPONSES]["utter_greet"].append({"text": "hi"})
     domain_with_changed_nlg = Domain.from_dict(domain_with_changed_nlg)
     importer.get_domain = lambda: domain_with_changed_nlg
 
     # finetuning
     loaded_validate = get_validation_method(
-        finetuning=False, load=True, core=core, nlu=nlu
+        finetuning=False,
+        load=True,
+        core=core,
+        nlu=nlu,
+        resource=trained_project_resource,
     )
     assert importer.get_domain() != old_domain
     loaded_validate(importer=importer)
 
 
-@pytest.mark.parametrize("nlu, core", [(True, False), (False, True), (True, True)])
+@pytest.mark.parametrize("nlu, core", _NLU_CORE_PARAMS, indirect=True)
 def test_validate_after_adding_action_to_domain(
     get_validation_method: Callable[..., ValidationMethodType],
+    trained_project_resource: Resource,
     project: Text,
     nlu: bool,
     core: bool,
 ):
-    # training
-    importer = _project_files(project)
+    importer = CachedProjectImporter(project)
     old_domain = importer.get_domain()
 
-    validate = get_validation_method(finetuning=False, load=False, core=core, nlu=nlu)
-    validate(importer=importer)
-
     # Add another action - via the response key
-    domain_with_new_action = old_domain.as_dict()
+    domain_with_new_action = _domain_as_dict_snapshot(old_domain)
     domain_with_new_action[KEY_RESPONSES]["utter_new"] = [{"text": "hi"}]
     domain_with_new_action = Domain.from_dict(domain_with_new_action)
     importer.get_domain = lambda: domain_with_new_action
 
     # finetuning
     loaded_validate = get_validation_method(
-        finetuning=True, load=True, core=core, nlu=nlu
+        finetuning=True,
+        load=True,
+        core=core,
+        nlu=nlu,
+        resource=trained_project_resource,
     )
     assert importer.get_domain() != old_domain
     if core:
@@ -187,7 +349,13 @@ def test_validate_after_adding_action_to_domain(
         loaded_validate(importer=importer)
 
 
-def _get_example_schema(num_epochs: int = 5, other_parameter: int = 10) -> GraphSchema:
+# the schema is cached - tests which modify it have to work on a copy
+@functools.lru_cache(maxsize=None)
+def _get_example_schema(
+    num_epochs: int = 5,
+    other_parameter: int = 10,
+    skip_indices: FrozenSet[int] = frozenset(),
+) -> GraphSchema:
     example_configs = [
         {
             "epochs": num_epochs,
@@ -203,126 +371,146 @@ def _get_example_schema(num_epochs: int = 5, other_parameter: int = 10) -> Graph
                 needs={}, uses=GraphComponent, constructor_name="", fn="", config=config
             )
             for idx, config in enumerate(example_configs)
+            if idx not in skip_indices
         }
     )
 
 
-@pytest.mark.parametrize("nlu, core", [(True, False), (False, True), (True, True)])
-def test_validate_after_changing_epochs_in_config(
-    get_validation_method: Callable[..., ValidationMethodType], nlu: bool, core: bool
-):
-    # training
-    schema1 = _get_example_schema(num_epochs=5)
-    validate = get_validation_method(
-        finetuning=False, load=False, nlu=nlu, core=core, graph_schema=schema1
+@pytest.fixture(scope="module")
+def trained_example_schema_resource(
+    default_model_storage: ModelStorage,
+    empty_data_importer: EmptyDataImporter,
+    nlu: bool,
+    core: bool,
+) -> Resource:
+    return _train_validator(
+        default_model_storage,
+        empty_data_importer,
+        nlu,
+        core,
+        graph_schema=_get_example_schema(),
     )
-    validate(importer=EmptyDataImporter())
 
+
+@pytest.mark.parametrize("nlu, core", _NLU_CORE_PARAMS, indirect=True)
+def test_validate_after_changing_epochs_in_config(
+    get_validation_method: Callable[..., ValidationMethodType],
+    trained_example_schema_resource: Resource,
+    empty_data_importer: EmptyDataImporter,
+    nlu: bool,
+    core: bool,
+):
     # change schema - replace all epoch settings by a different value
-    schema2 = _get_example_schema(num_epochs=5)
-    for node in schema2.nodes.values():
-        node.constructor_name = "other"
+    schema2 = GraphSchema(
+        nodes={
+            node_name: dataclasses.replace(node, constructor_name="other")
+            for node_name, node in _get_example_schema(num_epochs=5).nodes.items()
+        }
+    )
 
     # finetuning - does not complain
     loaded_validate = get_validation_method(
-        finetuning=True, load=True, nlu=nlu, core=core, graph_schema=schema2
+        finetuning=True,
+        load=True,
+        nlu=nlu,
+        core=core,
+        graph_schema=schema2,
+        resource=trained_example_schema_resource,
     )
-    loaded_validate(importer=EmptyDataImporter())
+    loaded_validate(importer=empty_data_importer)
 
 
-@pytest.mark.parametrize("nlu, core", [(True, False), (False, True), (True, True)])
+@pytest.mark.parametrize("nlu, core", _NLU_CORE_PARAMS, indirect=True)
 def test_validate_after_changing_constructor(
-    get_validation_method: Callable[..., ValidationMethodType], nlu: bool, core: bool
+    get_validation_method: Callable[..., ValidationMethodType],
+    trained_example_schema_resource: Resource,
+    empty_data_importer: EmptyDataImporter,
+    nlu: bool,
+    core: bool,
 ):
-    # training
-    schema1 = _get_example_schema(num_epochs=5)
-    validate = get_validation_method(
-        finetuning=False, load=False, nlu=nlu, core=core, graph_schema=schema1
-    )
-    validate(importer=EmptyDataImporter())
-
     # change schema - replace all epoch settings by a different value
     schema2 = _get_example_schema(num_epochs=10)
 
     # finetuning - does not complain
     loaded_validate = get_validation_method(
-        finetuning=True, load=True, nlu=nlu, core=core, graph_schema=schema2
+        finetuning=True,
+        load=True,
+        nlu=nlu,
+        core=core,
+        graph_schema=schema2,
+        resource=trained_example_schema_resource,
     )
-    loaded_validate(importer=EmptyDataImporter())
+    loaded_validate(importer=empty_data_importer)
 
 
-@pytest.mark.parametrize("nlu, core", [(True, False), (False, True), (True, True)])
+@pytest.mark.parametrize("nlu, core", _NLU_CORE_PARAMS, indirect=True)
 def test_validate_after_removing_node_from_schema(
-    get_validation_method: Callable[..., ValidationMethodType], nlu: bool, core: bool
+    get_validation_method: Callable[..., ValidationMethodType],
+    trained_example_schema_resource: Resource,
+    empty_data_importer: EmptyDataImporter,
+    nlu: bool,
+    core: bool,
 ):
-    # training
-    schema1 = _get_example_schema(num_epochs=5)
-    validate = get_validation_method(
-        finetuning=False, load=False, nlu=nlu, core=core, graph_schema=schema1
-    )
-    validate(importer=EmptyDataImporter())
-
     # change schema - remove a node
-    schema2 = copy.deepcopy(schema1)
-    schema2.nodes.pop(next(iter(schema2.nodes.keys())))
+    schema2 = _get_example_schema(num_epochs=5, skip_indices=frozenset({0}))
 
     # finetuning raises - doesn't matter if it's nlu/core/both
     loaded_validate = get_validation_method(
-        finetuning=True, load=True, nlu=nlu, core=core, graph_schema=schema2
+        finetuning=True,
+        load=True,
+        nlu=nlu,
+        core=core,
+        graph_schema=schema2,
+        resource=trained_example_schema_resource,
     )
     with pytest.raises(InvalidConfigException):
-        loaded_validate(importer=EmptyDataImporter())
+        loaded_validate(importer=empty_data_importer)
 
 
-@pytest.mark.parametrize("nlu, core", [(True, False), (False, True), (True, True)])
+@pytest.mark.parametrize("nlu, core", _NLU_CORE_PARAMS, indirect=True)
 def test_validate_after_adding_node_to_schema(
-    get_validation_method: Callable[..., ValidationMethodType], nlu: bool, core: bool
+    get_validation_method: Callable[..., ValidationMethodType],
+    empty_data_importer: EmptyDataImporter,
+    nlu: bool,
+    core: bool,
 ):
     # training
     schema1 = _get_example_schema()
-    schema2 = copy.deepcopy(schema1)
-    schema2.nodes.pop(next(iter(schema2.nodes.keys())))
+    schema2 = _get_example_schema(skip_indices=frozenset({0}))
 
     validate = get_validation_method(
         finetuning=False, load=False, nlu=nlu, core=core, graph_schema=schema2
     )
-    validate(importer=EmptyDataImporter())
+    validate(importer=empty_data_importer)
 
     # change schema - continue with the schema with one more node than before
     assert len(schema1.nodes) > len(schema2.nodes)
 
     # finetuning raises -  doesn't matter if it's nlu/core/both
     loaded_validate = get_validation_method(
-        finetuning=True, load=True, nlu=nlu, core=core, graph_schema=schema1
+        finetuning=True,
+        load=True,
+        nlu=nlu,
+        core=core,
+        graph_schema=schema1,
     )
     with pytest.raises(InvalidConfigException):
-        loaded_validate(importer=EmptyDataImporter())
+        loaded_validate(importer=empty_data_importer)
 
 
-@pytest.mark.parametrize(
-    "nlu, core, what",
-    [
-        (nlu, core, what)
-        for what in ["uses", "needs", "fn", "config"]
-        for nlu, core in [(True, False), (False, True), (True, True)]
-    ],
-)
+@pytest.mark.parametrize("what", ["uses", "needs", "fn", "config"])
+@pytest.mark.parametrize("nlu, core", _NLU_CORE_PARAMS, indirect=True)
 def test_validate_after_replacing_something_in_schema(
     get_validation_method: Callable[..., ValidationMethodType],
+    trained_example_schema_resource: Resource,
+    empty_data_importer: EmptyDataImporter,
     nlu: bool,
     core: bool,
     what: Text,
 ):
-    # training
-    schema1 = _get_example_schema()
-    validate = get_validation_method(
-        finetuning=False, load=False, nlu=nlu, core=core, graph_schema=schema1
-    )
-    validate(importer=EmptyDataImporter())
-
     # change schema
-    schema2 = copy.deepcopy(schema1)
-    schema_node = schema2.nodes["node-0"]
+    schema1 = _get_example_schema()
+    schema_node = dataclasses.replace(schema1.nodes["node-0"])
     if what == "uses":
         schema_node.uses = WhitespaceTokenizer
     elif what == "fn":
@@ -330,24 +518,33 @@ def test_validate_after_replacing_something_in_schema(
     elif what == "needs":
         schema_node.needs = {"something-new": "node-1"}
     elif what == "config":
-        schema_node.config["other-parameter"] = "some-new-value"
+        schema_node.config = {**schema_node.config, "other-parameter": "some-new-value"}
     else:
         assert False, "Please fix this test."
+    schema2 = GraphSchema(nodes={**schema1.nodes, "node-0": schema_node})
 
     # finetuning raises -  doesn't matter if it's nlu/core/both
     loaded_validate = get_validation_method(
-        finetuning=True, load=True, nlu=nlu, core=core, graph_schema=schema2
+        finetuning=True,
+        load=True,
+        nlu=nlu,
+        core=core,
+        graph_schema=schema2,
+        resource=trained_example_schema_resource,
     )
     with pytest.raises(InvalidConfigException):
-        loaded_validate(importer=EmptyDataImporter())
+        loaded_validate(importer=empty_data_importer)
 
 
-@pytest.mark.parametrize("nlu, core", [(True, False), (False, True), (True, True)])
+@pytest.mark.parametrize("nlu, core", _NLU_CORE_PARAMS, indirect=True)
 def test_validate_after_adding_adding_default_parameter(
-    get_validation_method: Callable[..., ValidationMethodType], nlu: bool, core: bool
+    get_validation_method: Callable[..., ValidationMethodType],
+    empty_data_importer: EmptyDataImporter,
+    nlu: bool,
+    core: bool,
 ):
     # create a schema and rely on rasa to fill in defaults later
-    schema1 = _get_example_schema()
+    schema1 = GraphSchema(nodes=dict(_get_example_schema().nodes))
     schema1.nodes["nlu-node"] = SchemaNode(
         needs={}, uses=WhitespaceTokenizer, constructor_name="", fn="", config={}
     )
@@ -359,10 +556,10 @@ def test_validate_after_adding_adding_default_parameter(
     validate = get_validation_method(
         finetuning=False, load=False, nlu=nlu, core=core, graph_schema=schema1
     )
-    validate(importer=EmptyDataImporter())
+    validate(importer=empty_data_importer)
 
     # same schema -- we just explicitly pass default values
-    schema2 = copy.deepcopy(schema1)
+    schema2 = GraphSchema(nodes=dict(schema1.nodes))
     schema2.nodes["nlu-node"] = SchemaNode(
         needs={},
         uses=WhitespaceTokenizer,
@@ -380,27 +577,34 @@ def test_validate_after_adding_adding_default_parameter(
 
     # finetuning *does not raise*
     loaded_validate = get_validation_method(
-        finetuning=True, load=True, nlu=nlu, core=core, graph_schema=schema2
+        finetuning=True,
+        load=True,
+        nlu=nlu,
+        core=core,
+        graph_schema=schema2,
     )
-    loaded_validate(importer=EmptyDataImporter())
+    loaded_validate(importer=empty_data_importer)
 
 
-@pytest.mark.parametrize(
-    "nlu, core,key",
-    [
-        (nlu, core, key)
-        for nlu, core in [(True, False), (False, True), (True, True)]
-        for key in [INTENT, ACTION_NAME]
-    ],
-)
+@functools.lru_cache(maxsize=None)
+def _msg(key: Text, item: Text, text: Optional[Text] = None) -> Message:
+    # shared between tests - the validator does not modify the messages
+    data = {key: item}
+    if text is not None:
+        data[TEXT] = text
+    return Message(data=data)
+
+
+@pytest.mark.parametrize("key", [INTENT, ACTION_NAME])
+@pytest.mark.parametrize("nlu, core", _NLU_CORE_PARAMS, indirect=True)
 def test_validate_after_removing_or_adding_intent_or_action_name(
     get_validation_method: Callable[..., ValidationMethodType],
     nlu: bool,
     core: bool,
     key: Text,
 ):
-    messages = [Message(data={key: "item-1"}), Message(data={key: "item-2"})]
-    message_with_new_item = Message(data={key: "item-3"})
+    messages = [_msg(key, "item-1"), _msg(key, "item-2")]
+    message_with_new_item = _msg(key, "item-3")
 
     # training
     importer = DummyNLUDataImporter(messages)
@@ -427,24 +631,15 @@ def test_validate_after_removing_or_adding_intent_or_action_name(
         validate(importer=importer3)
 
 
-@pytest.mark.parametrize(
-    "nlu, core,key",
-    [
-        (nlu, core, key)
-        for nlu, core in [(True, False), (False, True), (True, True)]
-        for key in [INTENT, ACTION_NAME]
-    ],
-)
+@pytest.mark.parametrize("key", [INTENT, ACTION_NAME])
+@pytest.mark.parametrize("nlu, core", _NLU_CORE_PARAMS, indirect=True)
 def test_validate_with_different_examples_for_intent_or_action_name(
     get_validation_method: Callable[..., ValidationMethodType],
     nlu: bool,
     core: bool,
     key: Text,
 ):
-    messages = [
-        Message(data={key: "item-1", TEXT: "a"}),
-        Message(data={key: "item-2", TEXT: "b"}),
-    ]
+    messages = [_msg(key, "item-1", "a"), _msg(key, "item-2", "b")]
 
     # training
     importer = DummyNLUDataImporter(messages)
@@ -456,31 +651,50 @@ def test_validate_with_different_examples_for_intent_or_action_name(
 
     # ... apply with different messages
     messages = [
-        Message(data={key: "item-1", TEXT: "c"}),
-        Message(data={key: "item-1", TEXT: "d"}),
-        Message(data={key: "item-2", TEXT: "e"}),
-        Message(data={key: "item-2", TEXT: "f"}),
+        _msg(key, "item-1", "c"),
+        _msg(key, "item-1", "d"),
+        _msg(key, "item-2", "e"),
+        _msg(key, "item-2", "f"),
     ]
     importer2 = DummyNLUDataImporter(messages)
     # does not complain:
     validate(importer=importer2)
 
 
+@functools.lru_cache(maxsize=None)
+def _dummy_intent_importer() -> DummyNLUDataImporter:
+    return DummyNLUDataImporter([Message(data={INTENT: "dummy"})])
+
+
+@pytest.fixture(scope="module")
+def old_version(request: SubRequest) -> Text:
+    return request.param
+
+
+@pytest.fixture(scope="module")
+def trained_version_resource(
+    default_model_storage: ModelStorage, nlu: bool, core: bool, old_version: Text
+) -> Resource:
+    with MonkeyPatch.context() as monkeypatch:
+        monkeypatch.setattr(rasa, "__version__", old_version)
+        return _train_validator(
+            default_model_storage, _dummy_intent_importer(), nlu, core
+        )
+
+
 @pytest.mark.parametrize(
-    "nlu, core, min_compatible_version, old_version, can_tune",
-    [
-        (nlu, core, old_version, min_compatible_version, can_tune)
-        for nlu, core in [(True, False), (False, True), (True, True)]
-        for old_version, min_compatible_version, can_tune in [
-            ("2.1.0", "2.1.0", True),
-            ("2.0.0", "2.1.0", True),
-            ("2.1.0", "2.0.0", False),
-        ]
-    ],
+    "min_compatible_version, old_version, can_tune",
+    [("2.1.0", "2.1.0", True), ("2.0.0", "2.1.0", True), ("2.1.0", "2.0.0", False)],
+    indirect=["old_version"],
+    # module scope as well for the direct arguments - otherwise `old_version`
+    # would be function-scoped and could not be used by `trained_version_resource`
+    scope="module",
 )
+@pytest.mark.parametrize("nlu, core", _NLU_CORE_PARAMS, indirect=True)
 def test_validate_with_other_version(
     monkeypatch: MonkeyPatch,
     get_validation_method: Callable[..., ValidationMethodType],
+    trained_version_resource: Resource,
     nlu: bool,
     core: bool,
     min_compatible_version: Text,
@@ -494,13 +708,15 @@ def test_validate_with_other_version(
         min_compatible_version,
     )
 
-    # training
-    importer = DummyNLUDataImporter([Message(data={INTENT: "dummy"})])
-    validate = get_validation_method(finetuning=False, load=False, nlu=nlu, core=core)
-    validate(importer=importer)
-
     # finetuning
-    validate = get_validation_method(finetuning=True, load=True, nlu=nlu, core=core)
+    importer = _dummy_intent_importer()
+    validate = get_validation_method(
+        finetuning=True,
+        load=True,
+        nlu=nlu,
+        core=core,
+        resource=trained_version_resource,
+    )
     if not can_tune:
         with pytest.raises(InvalidConfigException):
             validate(importer=importer)
@@ -508,13 +724,16 @@ def test_validate_with_other_version(
         validate(importer=importer)
 
 
-@pytest.mark.parametrize("nlu, core", [(True, False), (False, True), (True, True)])
+@pytest.mark.parametrize("nlu, core", _NLU_CORE_PARAMS, indirect=True)
 def test_validate_with_finetuning_fails_without_training(
-    get_validation_method: Callable[..., ValidationMethodType], nlu: bool, core: bool
+    get_validation_method: Callable[..., ValidationMethodType],
+    empty_data_importer: EmptyDataImporter,
+    nlu: bool,
+    core: bool,
 ):
     validate = get_validation_method(finetuning=True, load=False, nlu=nlu, core=core)
     with pytest.raises(InvalidConfigException):
-        validate(importer=EmptyDataImporter())
+        validate(importer=empty_data_importer)
 
 
 def test_loading_without_persisting(